@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from backend.config import Config
+
+# Priority classes (lower value is served first)
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITIES = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 1}
+
+# Absolute deadline (time.monotonic()) of the request being served.
+# Context variables are inherited by tasks and by copy_context().run, so the
+# deadline follows the request into sub-agent calls and HTTP fetches.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline has passed."""
+
+
+class QueueFullError(Exception):
+    """Raised when the wait queue has no room for a request (maps to HTTP 429)."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueTimeoutError(Exception):
+    """Raised when a request's deadline expires while it waits for a slot (maps to HTTP 503)."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]):
+    """Sets the request deadline for everything executed inside the block."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if no deadline is set."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline():
+    """Raises DeadlineExceeded if the current deadline has already passed."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+class AdmissionController:
+    """
+    Bounded concurrency limit with a bounded priority wait queue.
+
+    At most `max_concurrent` requests run at once. Up to `max_queue` more wait
+    for a slot, interactive before batch. Batch callers may only occupy
+    `max_batch_queue` queue entries, and a queued batch request is shed to make
+    room for an interactive one when the queue is full.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = Config.MAX_CONCURRENT_REQUESTS,
+        max_queue: int = Config.MAX_QUEUE_SIZE,
+        max_batch_queue: int = Config.MAX_BATCH_QUEUE_SIZE
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_batch_queue = min(max_batch_queue, max_queue)
+        self._active = 0
+        self._waiters = []  # heap of [priority, seq, future]
+        self._seq = itertools.count()
+        # Exponentially weighted moving average of service time, for Retry-After
+        self._avg_service_time = 1.0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Estimated seconds until a new request would get a slot."""
+        backlog = self.queued + self._active
+        estimate = self._avg_service_time * backlog / max(self.max_concurrent, 1)
+        return max(1, math.ceil(estimate))
+
+    def stats(self) -> dict:
+        return {
+            "active": self._active,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "avg_service_time": round(self._avg_service_time, 3)
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority: str = PRIORITY_INTERACTIVE, deadline: Optional[float] = None):
+        """Holds a concurrency slot for the duration of the block."""
+        await self._acquire(priority, deadline)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - start)
+
+    async def _acquire(self, priority: str, deadline: Optional[float]):
+        rank = PRIORITIES.get(priority, PRIORITIES[PRIORITY_BATCH])
+
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        if rank > PRIORITIES[PRIORITY_INTERACTIVE]:
+            queued_batch = sum(1 for entry in self._waiters if entry[0] == rank)
+            if queued_batch >= self.max_batch_queue:
+                raise QueueFullError("Batch queue is full", self.retry_after())
+
+        if len(self._waiters) >= self.max_queue and not self._shed_lower_priority(rank):
+            raise QueueFullError("Request queue is full", self.retry_after())
+
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                raise QueueTimeoutError("Deadline expired before admission", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [rank, next(self._seq), future]
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # The slot was handed over just as we gave up; pass it on
+                self._release(None)
+            else:
+                future.cancel()
+                self._remove(entry)
+            if isinstance(e, asyncio.TimeoutError):
+                raise QueueTimeoutError("Deadline expired while waiting in queue", self.retry_after())
+            raise
+
+    def _shed_lower_priority(self, rank: int) -> bool:
+        """Rejects the newest queued request with lower priority than `rank`."""
+        victims = [entry for entry in self._waiters if entry[0] > rank]
+        if not victims:
+            return False
+        victim = max(victims, key=lambda entry: (entry[0], entry[1]))
+        self._remove(victim)
+        victim[2].set_exception(QueueFullError("Shed for higher-priority request", self.retry_after()))
+        return True
+
+    def _remove(self, entry):
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+
+    def _release(self, service_time: Optional[float]):
+        if service_time is not None:
+            self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * service_time
+
+        # Hand the slot directly to the next waiter so no newcomer can jump the queue
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
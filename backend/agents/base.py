@@ -2,9 +2,9 @@ from typing import List, Callable, Optional, Dict, Any
 from google.adk import Agent as ADKAgent
 from google.adk.runners import InMemoryRunner
 from backend.config import Config
+from backend.admission import DeadlineExceeded, check_deadline, remaining_time
 import os
 import asyncio
-import concurrent.futures
 
 class BaseAgent:
     """
@@ -40,8 +40,6 @@ class BaseAgent:
         
         # Create runner for executing queries
         self.runner = InMemoryRunner(agent=self.agent)
-        # Thread pool for running async code from sync contexts (e.g., tools)
-        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
 
     async def query(self, input_text: str, session_id: str = None) -> Dict[str, Any]:
         """
@@ -57,33 +55,9 @@ class BaseAgent:
                 "answer": response_text,
                 "steps": []
             }
-        except Exception as e:
-            print(f"[{self.name}] Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return {"answer": f"Error processing request: {str(e)}", "steps": []}
-    
-    def query_sync(self, input_text: str, session_id: str = None) -> Dict[str, Any]:
-        """
-        Synchronous wrapper for query(). Use this from synchronous contexts (e.g., tools).
-        Runs the async query in a thread pool to avoid event loop conflicts.
-        """
-        print(f"[{self.name}] Processing (sync): {input_text}")
-        try:
-            # Check if we're in an async context
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context, run in thread pool
-                future = self._executor.submit(asyncio.run, self._run_query(input_text))
-                response_text = future.result()
-            except RuntimeError:
-                # No running loop, safe to use asyncio.run directly
-                response_text = asyncio.run(self._run_query(input_text))
-            
-            return {
-                "answer": response_text,
-                "steps": []
-            }
+        except DeadlineExceeded:
+            # Let the API layer report the timeout instead of a partial answer
+            raise
         except Exception as e:
             print(f"[{self.name}] Error: {e}")
             import traceback
@@ -92,8 +66,15 @@ class BaseAgent:
     
     async def _run_query(self, input_text: str) -> str:
         """Internal async method to run the query using ADK Runner."""
-        # run_debug returns a list of events
-        events = await self.runner.run_debug(input_text, quiet=True)
+        # run_debug returns a list of events; cancelled once the request deadline passes
+        check_deadline()
+        try:
+            events = await asyncio.wait_for(
+                self.runner.run_debug(input_text, quiet=True),
+                timeout=remaining_time()
+            )
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded("Request deadline exceeded")
         
         response_parts = []
         for event in events:
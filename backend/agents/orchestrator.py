@@ -13,21 +13,23 @@ class OrchestratorAgent(BaseAgent):
         self.researcher = ResearcherAgent()
         self.analyst = AnalystAgent()
         
-        # Define delegation tools
-        def ask_researcher(question: str) -> str:
+        # Define delegation tools.
+        # Async so ADK awaits them on the event loop instead of blocking it; the
+        # request deadline and task cancellation carry through to the sub-agent.
+        async def ask_researcher(question: str) -> str:
             """
             Delegates a research question to the Researcher Agent.
             Use this when you need to find scientific facts, papers, or clinical trials.
             """
-            result = self.researcher.query_sync(question)
+            result = await self.researcher.query(question)
             return result["answer"]
 
-        def ask_analyst(task: str) -> str:
+        async def ask_analyst(task: str) -> str:
             """
             Delegates a data analysis or calculation task to the Analyst Agent.
             Use this when you need to calculate stats, plot data, or run code.
             """
-            result = self.analyst.query_sync(task)
+            result = await self.analyst.query(task)
             return result["answer"]
             
         super().__init__(
@@ -1,6 +1,6 @@
 from backend.agents.base import BaseAgent
 from backend.config import Config
-from backend.tools.retrieval import search_pubmed, search_clinical_trials
+from backend.tools.retrieval import search_pubmed, search_clinical_trials, search_local_corpus, init_corpus_agent
 
 class ResearcherAgent(BaseAgent):
     """
@@ -8,19 +8,23 @@ class ResearcherAgent(BaseAgent):
     """
     
     def __init__(self):
+        # Load the local corpus index up front rather than inside the first tool call
+        init_corpus_agent()
         super().__init__(
             name="Researcher",
             model_name=Config.RESEARCHER_MODEL,
-            tools=[search_pubmed, search_clinical_trials],
+            tools=[search_pubmed, search_clinical_trials, search_local_corpus],
             system_instruction="""
             You are a Researcher Agent specialized in Treg cell therapy.
             Your goal is to find accurate scientific information using the provided tools.
             
             When asked to research a topic:
-            1. Use `search_pubmed` to find literature.
-            2. Use `search_clinical_trials` to find relevant studies.
-            3. Use `google_search` for general information or recent news not in PubMed.
-            4. Synthesize the findings into a concise summary.
-            5. Always cite your sources (PMID, NCT ID, or URL).
+            1. Use `search_local_corpus` first, with its source, year, journal or author filters
+               when the question names them (e.g. "trials since 2022", "papers by Bluestone").
+            2. Use `search_pubmed` to find literature.
+            3. Use `search_clinical_trials` to find relevant studies.
+            4. Use `google_search` for general information or recent news not in PubMed.
+            5. Synthesize the findings into a concise summary.
+            6. Always cite your sources (PMID, NCT ID, or URL).
             """
         )
@@ -1,10 +1,24 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Literal
 from contextlib import asynccontextmanager
+import asyncio
+import time
 import uvicorn
 import os
 
+from backend.config import Config
+from backend.admission import (
+    AdmissionController,
+    DeadlineExceeded,
+    QueueFullError,
+    QueueTimeoutError,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BATCH,
+    deadline_scope,
+    remaining_time,
+)
+
 # Import the Orchestrator
 try:
     from backend.agents.orchestrator import OrchestratorAgent
@@ -24,6 +38,9 @@ except ImportError as e:
 # Global agent instance
 agent = None
 
+# Bounds concurrent agent calls and queues/sheds the rest
+admission = AdmissionController()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -44,6 +61,8 @@ class QueryRequest(BaseModel):
     question: str
     session_id: Optional[str] = "default"
     model_type: Optional[str] = "pro" # pro or flash
+    priority: Literal["interactive", "batch"] = PRIORITY_INTERACTIVE
+    timeout: Optional[float] = Field(None, gt=0) # seconds; capped at the priority's default
 
 class Step(BaseModel):
     action: str
@@ -58,17 +77,33 @@ async def chat(request: QueryRequest):
     if not agent:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
+    max_timeout = Config.BATCH_TIMEOUT_SECONDS if request.priority == PRIORITY_BATCH else Config.INTERACTIVE_TIMEOUT_SECONDS
+    timeout = min(request.timeout, max_timeout) if request.timeout else max_timeout
+    deadline = time.monotonic() + timeout
+
     try:
-        # Note: In a real implementation, we'd pass model_config to the agent
-        # to dynamically switch models if supported by the BaseAgent logic.
-        result = await agent.query(request.question, session_id=request.session_id)
+        async with admission.slot(request.priority, deadline):
+            # The deadline is inherited by sub-agent calls and HTTP fetches
+            with deadline_scope(deadline):
+                # Note: In a real implementation, we'd pass model_config to the agent
+                # to dynamically switch models if supported by the BaseAgent logic.
+                result = await asyncio.wait_for(
+                    agent.query(request.question, session_id=request.session_id),
+                    timeout=remaining_time()
+                )
         return result
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except QueueTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except (asyncio.TimeoutError, DeadlineExceeded):
+        raise HTTPException(status_code=504, detail="Request deadline exceeded")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {"status": "ok", "admission": admission.stats()}
 
 @app.get("/")
 async def root():
@@ -0,0 +1,186 @@
+"""
+Benchmark for metadata pre-filtering in retrieval.
+
+Builds synthetic corpora of growing size with random embeddings and compares
+an unfiltered scan with pre-filtering through MetadataIndex. The unfiltered
+scan scores every document, keeps an over-fetched top-k and post-filters it,
+growing k only when fewer than k matches survive. Pre-filtering scores only
+the matching candidates.
+
+By default scoring is a pure-Python dot product, a stand-in for the brute-force
+scoring in llama-index's SimpleVectorStore, so it runs without an API key or
+llama-index. With --simple-vector-store the same comparison goes through
+SimpleVectorStore.query with node_ids, which is the path TregAgent uses.
+
+Usage:
+    python backend/benchmark_filters.py
+    python backend/benchmark_filters.py --sizes 1000,10000,100000 --dim 128
+    python backend/benchmark_filters.py --simple-vector-store
+"""
+import os
+import sys
+import time
+import heapq
+import random
+import argparse
+import operator
+
+# Add parent directory to path to allow imports when running as script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.metadata_index import MetadataIndex, normalize_year
+
+SOURCES = ["PubMed", "ClinicalTrials.gov"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+FILTERS = {
+    "author": {"author": "Bluestone"},
+    "source+year": {"source": "PubMed", "year_from": 2022},
+    "trials+year": {"source": "ClinicalTrials.gov", "year_from": 2022},
+    "journal": {"journal": "immunity"},
+    "author+year": {"author": "Bluestone", "year_from": 2022},
+}
+
+
+def make_corpus(size: int, dim: int, rng: random.Random):
+    journals = [f"Journal of Immunology Research {i}" for i in range(200)] + ["Immunity", "Nature Immunology"]
+    last_names = [f"Author{i}" for i in range(size // 2 + 50)] + ["Bluestone"]
+    records = []
+    vectors = []
+    for i in range(size):
+        source = SOURCES[0] if rng.random() < 0.8 else SOURCES[1]
+        record = {"id": f"doc{i}", "source": source}
+        if source == "PubMed":
+            record["journal"] = rng.choice(journals)
+            record["publication_date"] = f"{rng.randint(2005, 2025)}-{rng.choice(MONTHS)}"
+            # Rare author (~0.5% of papers) so author filters are selective
+            authors = [f"A {rng.choice(last_names)}" for _ in range(rng.randint(1, 6))]
+            if rng.random() < 0.005:
+                authors.append("Jeffrey A Bluestone")
+            record["authors"] = authors
+        else:
+            record["start_date"] = f"{rng.randint(2005, 2025)}-{rng.randint(1, 12):02d}"
+        records.append(record)
+        vectors.append([rng.gauss(0, 1) for _ in range(dim)])
+    return records, vectors
+
+
+def matches(record, source=None, year_from=None, year_to=None, journal=None, author=None):
+    """Row-by-row predicate, i.e. what filtering looks like without an index."""
+    if source and record["source"].lower() != source.lower():
+        return False
+    if year_from is not None or year_to is not None:
+        year = normalize_year(record.get("publication_date") or record.get("start_date"))
+        if year is None or (year_from is not None and year < year_from) or (year_to is not None and year > year_to):
+            return False
+    if journal and journal.lower() not in (record.get("journal") or "").lower():
+        return False
+    if author:
+        names = {key for name in record.get("authors", []) for key in (name.lower(), name.lower().split()[-1])}
+        if author.lower() not in names:
+            return False
+    return True
+
+
+def score(query, vectors, rows, top_k):
+    return heapq.nlargest(top_k, rows, key=lambda row: sum(map(operator.mul, query, vectors[row])))
+
+
+def post_filter(top_n, keep, size, top_k, oversample):
+    """
+    Over-fetches the top-n hits and keeps matching ones, growing n until top_k
+    matches survive or the whole corpus has been ranked.
+    """
+    n = top_k * oversample
+    while True:
+        hits = [hit for hit in top_n(min(n, size)) if keep(hit)]
+        if len(hits) >= top_k or n >= size:
+            return hits[:top_k]
+        n *= oversample
+
+
+def simple_vector_store(records, vectors):
+    """Loads the corpus into a llama-index SimpleVectorStore (node id = document id)."""
+    from llama_index.core.schema import TextNode
+    from llama_index.core.vector_stores import SimpleVectorStore
+
+    store = SimpleVectorStore()
+    store.add([TextNode(id_=record["id"], text="", embedding=vector) for record, vector in zip(records, vectors)])
+    return store
+
+
+def store_query(store, query, top_k, node_ids=None):
+    from llama_index.core.vector_stores.types import VectorStoreQuery
+
+    result = store.query(VectorStoreQuery(query_embedding=query, similarity_top_k=top_k, node_ids=node_ids))
+    return result.ids
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metadata pre-filtering")
+    parser.add_argument("--sizes", default="1000,5000,20000,50000", help="Comma-separated corpus sizes")
+    parser.add_argument("--dim", type=int, default=64, help="Embedding dimension")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--oversample", type=int, default=4, help="Over-fetch factor of the unfiltered scan")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--simple-vector-store", action="store_true",
+        help="Score through llama-index SimpleVectorStore instead of the pure-Python stand-in"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'docs':>8} {'filter':>12} {'matches':>8} {'scan ms':>10} {'filter ms':>10} {'prefilter ms':>13} {'speedup':>8}")
+    for size in [int(x) for x in args.sizes.split(",")]:
+        records, vectors = make_corpus(size, args.dim, rng)
+        query = [rng.gauss(0, 1) for _ in range(args.dim)]
+
+        build_time, index = timed(lambda: MetadataIndex.from_records(records), 1)
+        index.bitmaps  # materialize outside the timed queries
+        row_of = {doc_id: row for row, doc_id in enumerate(index.ids)}
+        store = simple_vector_store(records, vectors) if args.simple_vector_store else None
+
+        for name, filters in FILTERS.items():
+            keep = lambda doc_id: matches(records[row_of[doc_id]], **filters)
+
+            if store is not None:
+                def scan():
+                    return post_filter(lambda n: store_query(store, query, n), keep, size, args.top_k, args.oversample)
+
+                def prefilter():
+                    return store_query(store, query, args.top_k, node_ids=index.filter(**filters))
+            else:
+                def scan():
+                    # Every row is scored once; only the over-fetched top-n is post-filtered
+                    scores = [sum(map(operator.mul, query, vector)) for vector in vectors]
+                    top_n = lambda n: [index.ids[row] for row in heapq.nlargest(n, range(size), key=scores.__getitem__)]
+                    return post_filter(top_n, keep, size, args.top_k, args.oversample)
+
+                def prefilter():
+                    candidates = [row_of[doc_id] for doc_id in index.filter(**filters)]
+                    return [index.ids[row] for row in score(query, vectors, candidates, args.top_k)]
+
+            scan_time, expected = timed(scan, args.repeat)
+            filter_time, candidates = timed(lambda: index.filter(**filters), args.repeat)
+            prefilter_time, actual = timed(prefilter, args.repeat)
+            assert actual == expected, f"pre-filtered results differ for {name}"
+
+            print(
+                f"{size:>8} {name:>12} {len(candidates):>8} {scan_time * 1000:>10.1f} "
+                f"{filter_time * 1000:>10.2f} {prefilter_time * 1000:>13.2f} {scan_time / prefilter_time:>7.1f}x"
+            )
+        print(f"{size:>8} {'(build)':>12} {'':>8} {'':>10} {build_time * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,15 @@ class Config:
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
     EMAIL = os.getenv("EMAIL", "your.email@example.com")
     RETMAX = int(os.getenv("RETMAX", "20"))
+    HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+
+    # Admission Control
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "4"))
+    MAX_QUEUE_SIZE = int(os.getenv("MAX_QUEUE_SIZE", "16"))
+    MAX_BATCH_QUEUE_SIZE = int(os.getenv("MAX_BATCH_QUEUE_SIZE", "4"))
+    # Default deadlines (seconds) per priority class; callers may ask for less
+    INTERACTIVE_TIMEOUT_SECONDS = float(os.getenv("INTERACTIVE_TIMEOUT_SECONDS", "60"))
+    BATCH_TIMEOUT_SECONDS = float(os.getenv("BATCH_TIMEOUT_SECONDS", "300"))
     
     @staticmethod
     def get_model_config(agent_type: str):
@@ -12,11 +12,19 @@ import os
 # Add parent directory to path to allow imports when running as script
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.config import Config
+from backend.admission import remaining_time
 
 def fetch_url_content(url: str) -> bytes:
-    """Helper to fetch URL content using urllib."""
+    """Helper to fetch URL content using urllib. Bounded by the request deadline, if any."""
+    timeout = Config.HTTP_TIMEOUT_SECONDS
+    remaining = remaining_time()
+    if remaining is not None:
+        if remaining <= 0:
+            print(f"Skipping fetch of {url}: request deadline exceeded")
+            return None
+        timeout = min(timeout, remaining)
     try:
-        with urllib.request.urlopen(url) as response:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
             return response.read()
     except Exception as e:
         print(f"Error fetching {url}: {e}")
@@ -109,6 +117,8 @@ def fetch_pubmed_abstracts(query: str, max_results: int = Config.RETMAX) -> List
 
             # Extract Authors
             authors = []
+            # Surnames kept separately so multi-word ones ("van der Berg") stay searchable
+            author_last_names = []
             author_list = article.findall(".//AuthorList/Author")
             for author in author_list:
                 last_name = author.find("LastName")
@@ -118,6 +128,7 @@ def fetch_pubmed_abstracts(query: str, max_results: int = Config.RETMAX) -> List
                     if fore_name is not None:
                         name = f"{fore_name.text} {name}"
                     authors.append(name)
+                    author_last_names.append(last_name.text)
             
             articles.append({
                 "source": "PubMed",
@@ -127,7 +138,8 @@ def fetch_pubmed_abstracts(query: str, max_results: int = Config.RETMAX) -> List
                 "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
                 "journal": journal,
                 "publication_date": pub_date,
-                "authors": authors
+                "authors": authors,
+                "author_last_names": author_last_names
             })
         except Exception:
             continue
@@ -169,14 +181,21 @@ def fetch_clinical_trials(query: str, max_results: int = Config.RETMAX) -> List[
                 
                 desc_module = protocol.get("descriptionModule", {})
                 summary = desc_module.get("briefSummary", "No summary available.")
+
+                # Start date (e.g. "2019-05" or "2019-05-15"), used for year filters
+                status_module = protocol.get("statusModule", {})
+                start_date = status_module.get("startDateStruct", {}).get("date")
                 
-                studies.append({
+                study = {
                     "source": "ClinicalTrials.gov",
                     "id": nct_id,
                     "title": title,
                     "content": summary,
                     "url": f"https://clinicaltrials.gov/study/{nct_id}"
-                })
+                }
+                if start_date:
+                    study["start_date"] = start_date
+                studies.append(study)
             except Exception:
                 continue
                 
@@ -0,0 +1,181 @@
+"""
+Load test for the /chat endpoint.
+
+Fires more concurrent requests than the server admits and reports latency of
+the served requests alongside how many were shed (429/503) or timed out (504).
+With admission control, served latency should stay close to the service time
+instead of growing with the offered load.
+
+The mock agents do not call a model. The default "nested" mock reproduces the
+call shape of the real agent (async delegation tool -> sub-agent -> blocking
+fetch in a worker thread) but not its actual latency distribution; use --url
+against a running server for that.
+
+Usage:
+    python backend/load_test.py --mock                      # in-process server, simulated agent
+    python backend/load_test.py --mock --mock-mode blocking # sync tool on the event loop, for contrast
+    python backend/load_test.py --url http://localhost:8000 # running server
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import asyncio
+import threading
+import concurrent.futures
+from collections import Counter
+
+import requests
+
+# Add parent directory to path to allow imports when running as script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class SleepAgent:
+    """Stand-in for the OrchestratorAgent with a fixed service time."""
+
+    def __init__(self, service_time: float):
+        self.service_time = service_time
+
+    async def query(self, q, session_id=None):
+        await asyncio.sleep(self.service_time)
+        return {"answer": "ok", "steps": []}
+
+
+class NestedAgent:
+    """
+    Stand-in that follows the real /chat call shape: the orchestrator awaits an
+    async delegation tool, which awaits a sub-agent, whose tool does a blocking
+    fetch in a worker thread (as tools/retrieval.py does).
+    """
+
+    def __init__(self, service_time: float):
+        self.service_time = service_time
+
+    async def _sub_agent_query(self, question):
+        await asyncio.to_thread(time.sleep, self.service_time)
+        return {"answer": "ok", "steps": []}
+
+    async def query(self, q, session_id=None):
+        async def ask_researcher(question: str) -> str:
+            result = await self._sub_agent_query(question)
+            return result["answer"]
+
+        return {"answer": await ask_researcher(q), "steps": []}
+
+
+class BlockingAgent(NestedAgent):
+    """
+    Stand-in for a sync tool run directly on the event loop (what ADK does with
+    sync function tools). Shows how one blocking call stalls the whole server.
+    """
+
+    async def query(self, q, session_id=None):
+        def ask_researcher(question: str) -> str:
+            time.sleep(self.service_time)
+            return "ok"
+
+        return {"answer": ask_researcher(q), "steps": []}
+
+
+MOCK_AGENTS = {"sleep": SleepAgent, "nested": NestedAgent, "blocking": BlockingAgent}
+
+
+def start_mock_server(port: int, service_time: float, mode: str = "nested"):
+    """Runs api_server in a background thread with a simulated agent."""
+    import uvicorn
+    from backend import api_server
+
+    server = uvicorn.Server(uvicorn.Config(api_server.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    # Replace whatever the lifespan hook created
+    api_server.agent = MOCK_AGENTS[mode](service_time)
+    return server
+
+
+def send(url: str, priority: str, timeout: float):
+    start = time.monotonic()
+    try:
+        response = requests.post(
+            f"{url}/chat",
+            json={"question": "load test", "priority": priority, "timeout": timeout},
+            timeout=timeout + 5
+        )
+        status = response.status_code
+    except requests.RequestException:
+        status = "error"
+    return status, time.monotonic() - start
+
+
+def run_phase(url: str, concurrency: int, total: int, batch_ratio: float, timeout: float, rng: random.Random):
+    jobs = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(total):
+            priority = "batch" if rng.random() < batch_ratio else "interactive"
+            jobs.append((priority, pool.submit(send, url, priority, timeout)))
+        results = [(priority, job.result()) for priority, job in jobs]
+
+    codes = Counter(status for _, (status, _) in results)
+    served = {
+        p: [latency for priority, (status, latency) in results if status == 200 and priority == p]
+        for p in ("interactive", "batch")
+    }
+    return codes, served
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the /chat endpoint")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--mock", action="store_true", help="Start an in-process server with a simulated agent")
+    parser.add_argument(
+        "--mock-mode", choices=sorted(MOCK_AGENTS), default="nested",
+        help="Simulated agent: nested tool calls like the real agent (default), a plain sleep, "
+             "or a sync tool blocking the event loop"
+    )
+    parser.add_argument("--service-time", type=float, default=0.5, help="Simulated agent latency (mock only)")
+    parser.add_argument("--levels", default="1,4,16,64", help="Comma-separated client concurrency levels")
+    parser.add_argument("--requests", type=int, default=4, help="Requests per concurrent client")
+    parser.add_argument("--batch-ratio", type=float, default=0.25, help="Fraction of batch-priority requests")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request deadline in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not 0 <= args.batch_ratio <= 1:
+        parser.error("--batch-ratio must be between 0 and 1")
+
+    if args.mock:
+        port = int(args.url.rsplit(":", 1)[-1])
+        start_mock_server(port, args.service_time, args.mock_mode)
+
+    rng = random.Random(args.seed)
+
+    print("Latency (s) of served requests; int = interactive, batch = batch priority")
+    print(
+        f"{'clients':>8} {'sent':>6} {'200':>6} {'429':>6} {'503':>6} {'504':>6} "
+        f"{'int p50':>8} {'int p95':>8} {'int p99':>8} {'batch p50':>10} {'batch p95':>10}"
+    )
+    for level in [int(x) for x in args.levels.split(",")]:
+        codes, served = run_phase(args.url, level, level * args.requests, args.batch_ratio, args.timeout, rng)
+        interactive, batch = served["interactive"], served["batch"]
+        print(
+            f"{level:>8} {sum(codes.values()):>6} {codes[200]:>6} {codes[429]:>6} {codes[503]:>6} {codes[504]:>6} "
+            f"{percentile(interactive, 50):>8.2f} {percentile(interactive, 95):>8.2f} {percentile(interactive, 99):>8.2f} "
+            f"{percentile(batch, 50):>10.2f} {percentile(batch, 95):>10.2f}"
+        )
+        if codes["error"]:
+            print(f"         {codes['error']} requests failed to connect")
+
+
+if __name__ == "__main__":
+    main()
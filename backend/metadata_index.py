@@ -0,0 +1,196 @@
+import re
+from array import array
+from typing import Dict, List, Optional, Iterable
+
+YEAR_PATTERN = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def normalize_year(publication_date: Optional[str]) -> Optional[int]:
+    """
+    Extracts the year from a PubMed publication date or ClinicalTrials.gov start date.
+    Handles "2025-Nov-26", "2025-Sep", "2025", "2019-05-15" and MedlineDate forms like "2019 Jan-Feb".
+    """
+    if not publication_date:
+        return None
+    match = YEAR_PATTERN.search(publication_date)
+    return int(match.group(0)) if match else None
+
+
+def normalize_text(value: Optional[str]) -> Optional[str]:
+    """Lowercases and collapses whitespace so lookups are case-insensitive."""
+    if not value:
+        return None
+    return " ".join(value.lower().split())
+
+
+def author_keys(name: str, last_name: Optional[str] = None) -> List[str]:
+    """
+    Index keys for an author: the full name and the last name ("Jeffrey A Bluestone" -> both).
+    `last_name` is PubMed's LastName; without it (legacy records) the last word is used.
+    """
+    full = normalize_text(name)
+    if not full:
+        return []
+    last = normalize_text(last_name) or full.split(" ")[-1]
+    return [full] if last == full else [full, last]
+
+
+def _split(value) -> List[str]:
+    """Document metadata stores lists joined with "; "."""
+    if not value:
+        return []
+    return value.split("; ") if isinstance(value, str) else list(value)
+
+
+# Low-cardinality columns are kept as bitmaps; high-cardinality ones as posting lists
+BITMAP_COLUMNS = ("source", "year")
+POSTING_COLUMNS = ("journal", "author")
+
+
+class MetadataIndex:
+    """
+    Compact index over document metadata (source, year, journal, author).
+
+    Every column maps a normalized value to a posting list of row numbers
+    (array('I')). Source and year have few distinct values, so they are also
+    materialized as bitmaps (a Python int whose bit i is set when row i has
+    that value). Journal and author have many values, most of them rare, so
+    they stay as posting lists and are turned into a bitmap only for the rows a
+    query touches. Filters AND together, so candidate sets are computed
+    without touching the documents or their embeddings.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.postings: Dict[str, Dict] = {column: {} for column in BITMAP_COLUMNS + POSTING_COLUMNS}
+        self._bitmaps: Optional[Dict[str, Dict]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "MetadataIndex":
+        """Builds the index from raw records (as produced by data_ingestion) or Document metadata."""
+        index = cls()
+        for record in records:
+            index.add(record)
+        return index
+
+    def add(self, record: Dict):
+        row = len(self.ids)
+        self.ids.append(record["id"])
+
+        source = normalize_text(record.get("source"))
+        if source:
+            self._add_posting("source", source, row)
+
+        # Publication year for PubMed, start year for ClinicalTrials.gov
+        year = record.get("year")
+        if year is None:
+            year = normalize_year(record.get("publication_date") or record.get("start_date"))
+        if year is not None:
+            self._add_posting("year", int(year), row)
+
+        journal = normalize_text(record.get("journal"))
+        if journal and journal != "unknown journal":
+            self._add_posting("journal", journal, row)
+
+        authors = _split(record.get("authors"))
+        last_names = _split(record.get("author_last_names"))
+        if len(last_names) != len(authors):
+            last_names = [None] * len(authors)
+        for key in {key for author, last in zip(authors, last_names) for key in author_keys(author, last)}:
+            self._add_posting("author", key, row)
+
+    def _add_posting(self, column: str, key, row: int):
+        postings = self.postings[column]
+        if key not in postings:
+            postings[key] = array("I")
+        postings[key].append(row)
+        # Bitmaps are rebuilt lazily on the next query
+        self._bitmaps = None
+
+    def _to_bitmap(self, rows: Iterable[int]) -> int:
+        buffer = bytearray((len(self.ids) + 7) // 8)
+        for row in rows:
+            buffer[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(buffer, "little")
+
+    @property
+    def bitmaps(self) -> Dict[str, Dict]:
+        if self._bitmaps is None:
+            self._bitmaps = {
+                column: {key: self._to_bitmap(rows) for key, rows in self.postings[column].items()}
+                for column in BITMAP_COLUMNS
+            }
+        return self._bitmaps
+
+    def filter_bitmap(
+        self,
+        source: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        journal: Optional[str] = None,
+        author: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Returns the bitmap of rows matching all given filters, or None if no filter is set.
+
+        `source` matches exactly, `journal` matches as a substring and `author`
+        matches a full name or last name (all case-insensitive). Years are inclusive.
+        """
+        bitmaps = []
+
+        if source:
+            bitmaps.append(self.bitmaps["source"].get(normalize_text(source), 0))
+
+        if year_from is not None or year_to is not None:
+            low = year_from if year_from is not None else float("-inf")
+            high = year_to if year_to is not None else float("inf")
+            year_bitmap = 0
+            for year, bits in self.bitmaps["year"].items():
+                if low <= year <= high:
+                    year_bitmap |= bits
+            bitmaps.append(year_bitmap)
+
+        row_sets = []
+        if journal:
+            needle = normalize_text(journal)
+            row_sets.append(set().union(*(
+                rows for key, rows in self.postings["journal"].items() if needle in key
+            )))
+        if author:
+            row_sets.append(self.postings["author"].get(normalize_text(author), ()))
+
+        if row_sets:
+            # Intersect starting from the most selective posting list
+            row_sets.sort(key=len)
+            rows = set(row_sets[0])
+            for other in row_sets[1:]:
+                rows.intersection_update(other)
+            bitmaps.append(self._to_bitmap(rows))
+
+        if not bitmaps:
+            return None
+
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result &= bitmap
+        return result
+
+    def filter(self, **filters) -> Optional[List[str]]:
+        """Returns the ids of matching documents, or None if no filter is set (i.e. all documents)."""
+        bitmap = self.filter_bitmap(**filters)
+        if bitmap is None:
+            return None
+        return self.rows_to_ids(bitmap)
+
+    def rows_to_ids(self, bitmap: int) -> List[str]:
+        # Scan the binary string once (bit 0 is row 0) instead of shifting the int per row
+        bits = bin(bitmap)[:1:-1]
+        ids = []
+        row = bits.find("1")
+        while row != -1:
+            ids.append(self.ids[row])
+            row = bits.find("1", row + 1)
+        return ids
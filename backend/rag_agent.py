@@ -1,9 +1,11 @@
 import os
 import json
-from typing import List
+from typing import Dict, List, Optional
 from llama_index.core import Document, VectorStoreIndex, Settings
+from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.llms.gemini import Gemini
 from llama_index.embeddings.gemini import GeminiEmbedding
+from backend.metadata_index import MetadataIndex, normalize_year
 
 # Configuration
 DATA_PATH = "backend/data/raw_data.json"
@@ -25,22 +27,42 @@ def load_documents() -> List[Document]:
         # Create a text representation that includes metadata for the LLM to read
         text = f"Title: {item['title']}\nSource: {item['source']}\nID: {item['id']}\nContent: {item['content']}"
         
+        metadata = {
+            "source": item['source'],
+            "title": item['title'],
+            "url": item['url'],
+            "id": item['id']
+        }
+        # PubMed records carry bibliographic fields; ClinicalTrials.gov records a start date
+        if item.get('journal'):
+            metadata["journal"] = item['journal']
+        if item.get('publication_date'):
+            metadata["publication_date"] = item['publication_date']
+        if item.get('start_date'):
+            metadata["start_date"] = item['start_date']
+        # Publication year for PubMed, start year for ClinicalTrials.gov
+        year = normalize_year(item.get('publication_date') or item.get('start_date'))
+        if year is not None:
+            metadata["year"] = year
+        if item.get('authors'):
+            # Vector stores only accept flat metadata values
+            metadata["authors"] = "; ".join(item['authors'])
+        if item.get('author_last_names'):
+            metadata["author_last_names"] = "; ".join(item['author_last_names'])
+
         doc = Document(
+            id_=item['id'],
             text=text,
-            metadata={
-                "source": item['source'],
-                "title": item['title'],
-                "url": item['url'],
-                "id": item['id']
-            }
+            metadata=metadata,
+            excluded_embed_metadata_keys=["authors", "author_last_names"]
         )
         documents.append(doc)
     
     print(f"Loaded {len(documents)} documents.")
     return documents
 
-def initialize_index(force_rebuild: bool = False):
-    """Creates or loads the vector index."""
+def initialize_index(force_rebuild: bool = False, documents: Optional[List[Document]] = None):
+    """Creates or loads the vector index. `documents` are used when building and loaded if not given."""
     
     # Use Google Gemini for embeddings and generation
     # model_name defaults to "models/gemini-1.5-flash" or similar, check docs for latest
@@ -54,7 +76,8 @@ def initialize_index(force_rebuild: bool = False):
         index = load_index_from_storage(storage_context)
     else:
         print("Creating new index...")
-        documents = load_documents()
+        if documents is None:
+            documents = load_documents()
         index = VectorStoreIndex.from_documents(documents)
         index.storage_context.persist(persist_dir=PERSIST_DIR)
         
@@ -62,15 +85,93 @@ def initialize_index(force_rebuild: bool = False):
 
 class TregAgent:
     def __init__(self):
-        self.index = initialize_index()
+        documents = load_documents()
+        self.index = initialize_index(documents=documents)
+        ref_doc_info = self.index.ref_doc_info
+        if ref_doc_info and not any(doc.doc_id in ref_doc_info for doc in documents):
+            # Stores persisted before documents were keyed by source id cannot be pre-filtered
+            print("Index predates source-id document keys, rebuilding...")
+            self.index = initialize_index(force_rebuild=True, documents=documents)
+        else:
+            # Hash-based: embeds only new or changed records and is a no-op otherwise
+            refreshed = self.index.refresh_ref_docs(documents)
+            if any(refreshed):
+                print(f"Added or updated {sum(refreshed)} documents in the index.")
+                self.index.storage_context.persist(persist_dir=PERSIST_DIR)
+        self.metadata_index = MetadataIndex.from_records(doc.metadata for doc in documents)
         self.query_engine = self.index.as_query_engine(
             similarity_top_k=5,
             response_mode="compact"
         )
 
-    def query(self, question: str):
+    def candidate_node_ids(
+        self,
+        source: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        journal: Optional[str] = None,
+        author: Optional[str] = None
+    ) -> Optional[List[str]]:
+        """Node ids of documents matching the filters, or None if no filter is set."""
+        doc_ids = self.metadata_index.filter(
+            source=source, year_from=year_from, year_to=year_to, journal=journal, author=author
+        )
+        if doc_ids is None:
+            return None
+        ref_doc_info = self.index.ref_doc_info
+        return [node_id for doc_id in doc_ids for node_id in ref_doc_info[doc_id].node_ids]
+
+    def retrieve(
+        self,
+        question: str,
+        source: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        journal: Optional[str] = None,
+        author: Optional[str] = None,
+        top_k: int = 5
+    ) -> List[Dict]:
+        """
+        Returns the top matching documents (metadata plus text) without LLM synthesis.
+        Metadata filters restrict the candidates before vector scoring.
+        """
+        node_ids = self.candidate_node_ids(
+            source=source, year_from=year_from, year_to=year_to, journal=journal, author=author
+        )
+        if node_ids is not None and not node_ids:
+            return []
+        retriever = self.index.as_retriever(similarity_top_k=top_k, node_ids=node_ids)
+        return [
+            {**node.metadata, "score": node.score, "content": node.get_content()}
+            for node in retriever.retrieve(question)
+        ]
+
+    def query(
+        self,
+        question: str,
+        source: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        journal: Optional[str] = None,
+        author: Optional[str] = None
+    ):
+        """
+        Answers a question from the indexed corpus.
+        Metadata filters restrict the candidates before vector scoring.
+        """
         print(f"Agent querying: {question}")
-        response = self.query_engine.query(question)
+        node_ids = self.candidate_node_ids(
+            source=source, year_from=year_from, year_to=year_to, journal=journal, author=author
+        )
+        if node_ids is None:
+            query_engine = self.query_engine
+        elif not node_ids:
+            return {"answer": "No documents match the given filters.", "sources": []}
+        else:
+            retriever = self.index.as_retriever(similarity_top_k=5, node_ids=node_ids)
+            query_engine = RetrieverQueryEngine.from_args(retriever, response_mode="compact")
+
+        response = query_engine.query(question)
         return {
             "answer": str(response),
             "sources": [
@@ -84,3 +185,7 @@ if __name__ == "__main__":
     response = agent.query("What are the optimal conditions for Treg expansion?")
     print("\nAnswer:", response["answer"])
     print("\nSources:", response["sources"])
+
+    response = agent.query("Which CAR-Treg approaches have been published?", source="PubMed", year_from=2022)
+    print("\nFiltered answer:", response["answer"])
+    print("\nFiltered sources:", response["sources"])
@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+
+from backend import admission
+from backend.admission import (
+    AdmissionController,
+    DeadlineExceeded,
+    QueueFullError,
+    QueueTimeoutError,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    check_deadline,
+    deadline_scope,
+    remaining_time,
+)
+
+
+async def settle():
+    """Lets pending tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_admits_up_to_limit_without_queueing():
+    async def run():
+        controller = AdmissionController(max_concurrent=2, max_queue=2, max_batch_queue=1)
+        await controller._acquire(PRIORITY_INTERACTIVE, None)
+        await controller._acquire(PRIORITY_BATCH, None)
+        assert controller.active == 2
+        assert controller.queued == 0
+        controller._release(0.1)
+        controller._release(0.1)
+        assert controller.active == 0
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, max_batch_queue=1)
+        await controller._acquire(PRIORITY_INTERACTIVE, None)
+        waiter = asyncio.create_task(controller._acquire(PRIORITY_INTERACTIVE, None))
+        await settle()
+
+        with pytest.raises(QueueFullError) as excinfo:
+            await controller._acquire(PRIORITY_INTERACTIVE, None)
+        assert excinfo.value.retry_after >= 1
+
+        controller._release(0.1)
+        await waiter
+        assert controller.active == 1
+        controller._release(0.1)
+        assert controller.active == 0
+
+    asyncio.run(run())
+
+
+def test_batch_limited_to_its_queue_share():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=4, max_batch_queue=1)
+        await controller._acquire(PRIORITY_INTERACTIVE, None)
+        batch = asyncio.create_task(controller._acquire(PRIORITY_BATCH, None))
+        await settle()
+
+        with pytest.raises(QueueFullError):
+            await controller._acquire(PRIORITY_BATCH, None)
+        # Interactive callers can still use the rest of the queue
+        interactive = asyncio.create_task(controller._acquire(PRIORITY_INTERACTIVE, None))
+        await settle()
+        assert controller.queued == 2
+
+        for task in (batch, interactive):
+            task.cancel()
+        await asyncio.gather(batch, interactive, return_exceptions=True)
+        assert controller.queued == 0
+
+    asyncio.run(run())
+
+
+def test_interactive_sheds_newest_queued_batch():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=2, max_batch_queue=2)
+        await controller._acquire(PRIORITY_INTERACTIVE, None)
+        old_batch = asyncio.create_task(controller._acquire(PRIORITY_BATCH, None))
+        await settle()
+        new_batch = asyncio.create_task(controller._acquire(PRIORITY_BATCH, None))
+        await settle()
+
+        interactive = asyncio.create_task(controller._acquire(PRIORITY_INTERACTIVE, None))
+        await settle()
+        with pytest.raises(QueueFullError):
+            await new_batch
+        assert not old_batch.done()
+        assert controller.queued == 2
+
+        # Interactive is served before the older batch request
+        controller._release(0.1)
+        await interactive
+        assert not old_batch.done()
+        controller._release(0.1)
+        await old_batch
+        controller._release(0.1)
+        assert controller.active == 0
+
+    asyncio.run(run())
+
+
+def test_queue_timeout_removes_waiter():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=2, max_batch_queue=1)
+        await controller._acquire(PRIORITY_INTERACTIVE, None)
+
+        with pytest.raises(QueueTimeoutError) as excinfo:
+            await controller._acquire(PRIORITY_INTERACTIVE, time.monotonic() + 0.05)
+        assert excinfo.value.retry_after >= 1
+        assert controller.queued == 0
+
+        with pytest.raises(QueueTimeoutError):
+            await controller._acquire(PRIORITY_INTERACTIVE, time.monotonic() - 1)
+
+        controller._release(0.1)
+        assert controller.active == 0
+
+    asyncio.run(run())
+
+
+def test_slot_handed_over_during_timeout_is_passed_on(monkeypatch):
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=2, max_batch_queue=1)
+        await controller._acquire(PRIORITY_INTERACTIVE, None)
+
+        async def handoff_then_timeout(awaitable, timeout):
+            # The holder finishes and hands its slot over just as the waiter times out
+            controller._release(0.1)
+            awaitable.cancel()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(admission.asyncio, "wait_for", handoff_then_timeout)
+        with pytest.raises(QueueTimeoutError):
+            await controller._acquire(PRIORITY_INTERACTIVE, time.monotonic() + 10)
+
+        # The granted slot was released rather than leaked
+        assert controller.active == 0
+        assert controller.queued == 0
+
+    asyncio.run(run())
+
+
+def test_slot_context_releases_on_error():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, max_batch_queue=1)
+        with pytest.raises(RuntimeError):
+            async with controller.slot(PRIORITY_INTERACTIVE):
+                assert controller.active == 1
+                raise RuntimeError("boom")
+        assert controller.active == 0
+
+    asyncio.run(run())
+
+
+def test_deadline_scope():
+    assert remaining_time() is None
+    with deadline_scope(time.monotonic() + 5):
+        assert 0 < remaining_time() <= 5
+        check_deadline()
+    assert remaining_time() is None
+
+    with deadline_scope(time.monotonic() - 1):
+        with pytest.raises(DeadlineExceeded):
+            check_deadline()
+
+
+def test_deadline_follows_into_tasks_and_threads():
+    async def run():
+        async def child():
+            return remaining_time()
+
+        with deadline_scope(time.monotonic() + 5):
+            in_task = await asyncio.create_task(child())
+            in_thread = await asyncio.to_thread(remaining_time)
+        assert in_task is not None and in_task > 0
+        assert in_thread is not None and in_thread > 0
+
+    asyncio.run(run())
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import api_server
+from backend.admission import AdmissionController, DeadlineExceeded, remaining_time
+from backend.config import Config
+
+
+class StubAgent:
+    """Async agent that records the deadline it saw and optionally sleeps or raises."""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.remaining = None
+
+    async def query(self, q, session_id=None):
+        self.remaining = remaining_time()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"answer": f"echo: {q}", "steps": []}
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    controller = AdmissionController(max_concurrent=1, max_queue=1, max_batch_queue=1)
+    monkeypatch.setattr(api_server, "admission", controller)
+    return controller
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = StubAgent()
+    monkeypatch.setattr(api_server, "agent", agent)
+    return agent
+
+
+@pytest.fixture
+def client():
+    # No context manager: the lifespan hook would replace the stub agent
+    return TestClient(api_server.app)
+
+
+def test_chat_ok(client, controller, agent):
+    response = client.post("/chat", json={"question": "hi"})
+    assert response.status_code == 200
+    assert response.json()["answer"] == "echo: hi"
+    assert controller.active == 0
+
+
+def test_full_queue_returns_429_with_retry_after(client, controller, agent):
+    controller.max_queue = 0
+    controller._active = 1  # the only slot is busy
+    response = client.post("/chat", json={"question": "hi"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_deadline_in_queue_returns_503_with_retry_after(client, controller, agent):
+    controller._active = 1  # the only slot is busy and never released
+    response = client.post("/chat", json={"question": "hi", "timeout": 0.05})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert controller.queued == 0
+
+
+def test_deadline_while_running_returns_504(client, controller, agent):
+    agent.delay = 1.0
+    response = client.post("/chat", json={"question": "hi", "timeout": 0.05})
+    assert response.status_code == 504
+    assert "Retry-After" not in response.headers
+    assert controller.active == 0
+
+
+def test_deadline_exceeded_from_sub_agent_returns_504(client, controller, agent):
+    agent.error = DeadlineExceeded("Request deadline exceeded")
+    response = client.post("/chat", json={"question": "hi"})
+    assert response.status_code == 504
+    assert controller.active == 0
+
+
+def test_agent_error_returns_500(client, controller, agent):
+    agent.error = ValueError("boom")
+    response = client.post("/chat", json={"question": "hi"})
+    assert response.status_code == 500
+    assert controller.active == 0
+
+
+@pytest.mark.parametrize("priority, setting", [
+    ("interactive", "INTERACTIVE_TIMEOUT_SECONDS"),
+    ("batch", "BATCH_TIMEOUT_SECONDS"),
+])
+def test_timeout_capped_per_priority(client, controller, agent, monkeypatch, priority, setting):
+    monkeypatch.setattr(Config, "INTERACTIVE_TIMEOUT_SECONDS", 2.0)
+    monkeypatch.setattr(Config, "BATCH_TIMEOUT_SECONDS", 3.0)
+    cap = getattr(Config, setting)
+
+    response = client.post("/chat", json={"question": "hi", "priority": priority, "timeout": 100})
+    assert response.status_code == 200
+    assert 0 < agent.remaining <= cap
+
+    # Without a timeout the priority's default applies
+    client.post("/chat", json={"question": "hi", "priority": priority})
+    assert cap - 1 < agent.remaining <= cap
+
+    # Shorter timeouts are honoured
+    client.post("/chat", json={"question": "hi", "priority": priority, "timeout": 0.5})
+    assert agent.remaining <= 0.5
+
+
+@pytest.mark.parametrize("body", [
+    {"question": "hi", "timeout": 0},
+    {"question": "hi", "timeout": -1},
+    {"question": "hi", "priority": "urgent"},
+])
+def test_invalid_request_returns_422(client, controller, agent, body):
+    response = client.post("/chat", json=body)
+    assert response.status_code == 422
+    assert agent.remaining is None
+
+
+def test_health_reports_admission_stats(client, controller):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["admission"]["max_concurrent"] == 1
@@ -0,0 +1,129 @@
+import pytest
+
+from backend.metadata_index import MetadataIndex, author_keys, normalize_year
+
+RECORDS = [
+    {
+        "id": "1", "source": "PubMed", "journal": "Immunity", "publication_date": "2023-Nov-26",
+        "authors": ["Jeffrey A Bluestone", "Qizhi Tang"]
+    },
+    {
+        "id": "2", "source": "PubMed", "journal": "Nature Immunology", "publication_date": "2019 Jan-Feb",
+        "authors": ["Qizhi Tang"]
+    },
+    {
+        "id": "3", "source": "PubMed", "journal": "Unknown Journal", "publication_date": "2021",
+        "authors": []
+    },
+    {"id": "NCT1", "source": "ClinicalTrials.gov", "start_date": "2022-05-15"},
+    {"id": "NCT2", "source": "ClinicalTrials.gov"},
+]
+
+
+@pytest.fixture
+def index():
+    return MetadataIndex.from_records(RECORDS)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-Nov-26", 2025),
+    ("2025-Sep", 2025),
+    ("2025", 2025),
+    ("2019 Jan-Feb", 2019),
+    ("2022-05-15", 2022),
+    ("Unknown Date", None),
+    (None, None),
+])
+def test_normalize_year(value, expected):
+    assert normalize_year(value) == expected
+
+
+def test_author_keys():
+    assert author_keys("Jeffrey A Bluestone") == ["jeffrey a bluestone", "bluestone"]
+    assert author_keys("Consortium") == ["consortium"]
+    assert author_keys("") == []
+    assert author_keys("Laura Lansink Rotgerink", "Lansink Rotgerink") == [
+        "laura lansink rotgerink", "lansink rotgerink"
+    ]
+
+
+def test_multi_word_surnames():
+    index = MetadataIndex.from_records([
+        {
+            "id": "a", "source": "PubMed",
+            "authors": ["Laura Lansink Rotgerink", "Pieter van der Berg"],
+            "author_last_names": ["Lansink Rotgerink", "van der Berg"]
+        },
+        # Document metadata form
+        {
+            "id": "b", "source": "PubMed",
+            "authors": "Pieter van der Berg; Qizhi Tang",
+            "author_last_names": "van der Berg; Tang"
+        },
+        # Legacy record without last names falls back to the last word
+        {"id": "c", "source": "PubMed", "authors": ["Pieter van der Berg"]},
+    ])
+    assert index.filter(author="Lansink Rotgerink") == ["a"]
+    assert index.filter(author="van der Berg") == ["a", "b"]
+    assert index.filter(author="Tang") == ["b"]
+    assert index.filter(author="berg") == ["c"]
+    assert index.filter(author="Pieter van der Berg") == ["a", "b", "c"]
+
+
+def test_no_filters_means_all_documents(index):
+    assert index.filter() is None
+    assert index.filter_bitmap() is None
+
+
+def test_source_filter(index):
+    assert index.filter(source="clinicaltrials.gov") == ["NCT1", "NCT2"]
+    assert index.filter(source="arXiv") == []
+
+
+def test_year_range_uses_trial_start_date(index):
+    assert index.filter(year_from=2022) == ["1", "NCT1"]
+    assert index.filter(year_to=2021) == ["2", "3"]
+    assert index.filter(year_from=2021, year_to=2022) == ["3", "NCT1"]
+    assert index.filter(source="ClinicalTrials.gov", year_from=2022) == ["NCT1"]
+
+
+def test_journal_substring_skips_unknown(index):
+    assert index.filter(journal="immun") == ["1", "2"]
+    assert index.filter(journal="IMMUNITY") == ["1"]
+    assert index.filter(journal="unknown") == []
+
+
+def test_author_full_or_last_name(index):
+    assert index.filter(author="Bluestone") == ["1"]
+    assert index.filter(author="jeffrey a bluestone") == ["1"]
+    assert index.filter(author="Tang") == ["1", "2"]
+    assert index.filter(author="Jeffrey") == []
+
+
+def test_filters_are_anded(index):
+    # Posting lists intersected with each other and with bitmaps
+    assert index.filter(author="Tang", journal="nature") == ["2"]
+    assert index.filter(author="Tang", year_from=2020) == ["1"]
+    assert index.filter(author="Tang", source="ClinicalTrials.gov") == []
+    assert index.filter(author="Bluestone", journal="nature") == []
+
+
+def test_document_metadata_form():
+    # rag_agent stores authors joined with "; " and a precomputed year
+    index = MetadataIndex.from_records([
+        {"id": "a", "source": "PubMed", "year": 2024, "authors": "Jeffrey A Bluestone; Qizhi Tang"}
+    ])
+    assert index.filter(author="Tang", year_from=2024) == ["a"]
+
+
+def test_bitmaps_rebuilt_after_add(index):
+    assert index.filter(source="PubMed") == ["1", "2", "3"]
+    index.add({"id": "4", "source": "PubMed", "publication_date": "2024"})
+    assert index.filter(source="PubMed") == ["1", "2", "3", "4"]
+    assert index.filter(year_from=2024) == ["4"]
+
+
+def test_many_rows():
+    records = [{"id": str(i), "source": "PubMed" if i % 3 else "ClinicalTrials.gov"} for i in range(1000)]
+    index = MetadataIndex.from_records(records)
+    assert index.filter(source="ClinicalTrials.gov") == [str(i) for i in range(0, 1000, 3)]
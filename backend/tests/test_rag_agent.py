@@ -0,0 +1,98 @@
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from llama_index.core import Document
+
+from backend import rag_agent
+
+
+class StubStorageContext:
+    def __init__(self):
+        self.persisted = 0
+
+    def persist(self, persist_dir=None):
+        self.persisted += 1
+
+
+class StubIndex:
+    """Minimal stand-in for a persisted VectorStoreIndex keyed by document hash."""
+
+    def __init__(self, documents):
+        self.hashes = {doc.doc_id: doc.hash for doc in documents}
+        self.storage_context = StubStorageContext()
+        self.embedded = []
+
+    @property
+    def ref_doc_info(self):
+        return dict.fromkeys(self.hashes)
+
+    def refresh_ref_docs(self, documents):
+        refreshed = []
+        for doc in documents:
+            changed = self.hashes.get(doc.doc_id) != doc.hash
+            if changed:
+                self.hashes[doc.doc_id] = doc.hash
+                self.embedded.append(doc.doc_id)
+            refreshed.append(changed)
+        return refreshed
+
+    def as_query_engine(self, **kwargs):
+        return None
+
+
+def make_doc(doc_id, text="abstract", **metadata):
+    return Document(id_=doc_id, text=text, metadata={"id": doc_id, "source": "PubMed", **metadata})
+
+
+@pytest.fixture
+def stored():
+    return [make_doc("1"), make_doc("NCT1", source="ClinicalTrials.gov")]
+
+
+def build_agent(monkeypatch, stored, documents):
+    index = StubIndex(stored)
+    rebuilds = []
+
+    def initialize_index(force_rebuild=False, documents=None):
+        if force_rebuild:
+            rebuilds.append(documents)
+            return StubIndex(documents)
+        return index
+
+    monkeypatch.setattr(rag_agent, "load_documents", lambda: documents)
+    monkeypatch.setattr(rag_agent, "initialize_index", initialize_index)
+    return rag_agent.TregAgent(), index, rebuilds
+
+
+def test_unchanged_documents_are_not_reembedded(monkeypatch, stored):
+    agent, index, rebuilds = build_agent(monkeypatch, stored, list(stored))
+    assert index.embedded == []
+    assert index.storage_context.persisted == 0
+    assert rebuilds == []
+
+
+def test_changed_metadata_is_reembedded(monkeypatch, stored):
+    # Same ids, but re-ingestion added a trial start date
+    documents = [stored[0], make_doc("NCT1", source="ClinicalTrials.gov", start_date="2022-05")]
+    agent, index, rebuilds = build_agent(monkeypatch, stored, documents)
+    assert index.embedded == ["NCT1"]
+    assert index.storage_context.persisted == 1
+    assert rebuilds == []
+    assert agent.metadata_index.filter(year_from=2022) == ["NCT1"]
+
+
+def test_new_document_is_inserted(monkeypatch, stored):
+    documents = stored + [make_doc("2")]
+    agent, index, rebuilds = build_agent(monkeypatch, stored, documents)
+    assert index.embedded == ["2"]
+    assert index.storage_context.persisted == 1
+    assert rebuilds == []
+
+
+def test_legacy_store_is_rebuilt(monkeypatch):
+    legacy = [Document(text="abstract")]  # random doc ids from before source-id keys
+    documents = [make_doc("1"), make_doc("2")]
+    agent, index, rebuilds = build_agent(monkeypatch, legacy, documents)
+    assert rebuilds == [documents]
+    assert index.embedded == []
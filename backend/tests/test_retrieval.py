@@ -0,0 +1,97 @@
+import asyncio
+import json
+import sys
+import types
+
+import pytest
+
+from backend.tools import retrieval
+
+
+class StubCorpusAgent:
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+
+    def retrieve(self, question, **filters):
+        self.calls.append((question, filters))
+        if self.error:
+            raise self.error
+        return [{"id": "1", "source": "PubMed", "year": 2023, "score": 0.9}]
+
+
+@pytest.fixture(autouse=True)
+def reset_corpus_agent(monkeypatch):
+    monkeypatch.setattr(retrieval, "_corpus_agent", None)
+    monkeypatch.setattr(retrieval, "_corpus_agent_error", None)
+
+
+def test_search_local_corpus_forwards_filters(monkeypatch):
+    agent = StubCorpusAgent()
+    monkeypatch.setattr(retrieval, "_get_corpus_agent", lambda: agent)
+
+    result = asyncio.run(retrieval.search_local_corpus(
+        "CAR-Treg", source="ClinicalTrials.gov", year_from=2022, author="Bluestone"
+    ))
+
+    assert json.loads(result) == [{"id": "1", "source": "PubMed", "year": 2023, "score": 0.9}]
+    assert agent.calls == [("CAR-Treg", {
+        "source": "ClinicalTrials.gov",
+        "year_from": 2022,
+        "year_to": None,
+        "journal": None,
+        "author": "Bluestone"
+    })]
+
+
+def test_search_local_corpus_unavailable(monkeypatch):
+    def unavailable():
+        raise RuntimeError("No module named 'llama_index'")
+
+    monkeypatch.setattr(retrieval, "_get_corpus_agent", unavailable)
+    result = json.loads(asyncio.run(retrieval.search_local_corpus("CAR-Treg")))
+    assert result == {"error": "Local corpus unavailable: No module named 'llama_index'"}
+
+
+def test_search_local_corpus_search_error(monkeypatch):
+    monkeypatch.setattr(retrieval, "_get_corpus_agent", lambda: StubCorpusAgent(ValueError("quota")))
+    result = json.loads(asyncio.run(retrieval.search_local_corpus("CAR-Treg")))
+    assert result == {"error": "Local corpus search failed: quota"}
+
+
+def test_get_corpus_agent_before_init():
+    with pytest.raises(RuntimeError, match="not initialized"):
+        retrieval._get_corpus_agent()
+
+
+def test_init_corpus_agent_caches_failure(monkeypatch):
+    attempts = []
+
+    class FailingTregAgent:
+        def __init__(self):
+            attempts.append(1)
+            raise FileNotFoundError("Data file not found")
+
+    monkeypatch.setitem(sys.modules, "backend.rag_agent", types.SimpleNamespace(TregAgent=FailingTregAgent))
+    retrieval.init_corpus_agent()
+    retrieval.init_corpus_agent()
+
+    assert len(attempts) == 1
+    result = json.loads(asyncio.run(retrieval.search_local_corpus("CAR-Treg")))
+    assert result == {"error": "Local corpus unavailable: Data file not found"}
+
+
+def test_init_corpus_agent_builds_once(monkeypatch):
+    built = []
+
+    class TregAgent(StubCorpusAgent):
+        def __init__(self):
+            super().__init__()
+            built.append(self)
+
+    monkeypatch.setitem(sys.modules, "backend.rag_agent", types.SimpleNamespace(TregAgent=TregAgent))
+    retrieval.init_corpus_agent()
+    retrieval.init_corpus_agent()
+
+    assert len(built) == 1
+    assert retrieval._get_corpus_agent() is built[0]
@@ -1,7 +1,34 @@
 import json
+import asyncio
+from typing import Optional
 from backend.data_ingestion import fetch_pubmed_abstracts, fetch_clinical_trials
 
-def search_pubmed(query: str) -> str:
+# Local corpus agent, built once at startup by init_corpus_agent()
+_corpus_agent = None
+_corpus_agent_error = None
+
+def init_corpus_agent():
+    """
+    Builds the local corpus agent (loads or refreshes the vector index).
+    Called once at startup; a failure (e.g. missing llama-index, data or API key)
+    is cached so tool calls fail fast instead of retrying the build.
+    """
+    global _corpus_agent, _corpus_agent_error
+    if _corpus_agent is not None or _corpus_agent_error is not None:
+        return
+    try:
+        from backend.rag_agent import TregAgent
+        _corpus_agent = TregAgent()
+    except Exception as e:
+        print(f"Local corpus unavailable: {e}")
+        _corpus_agent_error = e
+
+def _get_corpus_agent():
+    if _corpus_agent is None:
+        raise RuntimeError(str(_corpus_agent_error) if _corpus_agent_error else "not initialized")
+    return _corpus_agent
+
+async def search_pubmed(query: str) -> str:
     """
     Searches PubMed for medical abstracts related to the query.
     
@@ -11,10 +38,12 @@ def search_pubmed(query: str) -> str:
     Returns:
         A JSON string containing a list of articles with titles and abstracts.
     """
-    results = fetch_pubmed_abstracts(query, max_results=5)
+    # Fetch in a worker thread so the event loop is not blocked; to_thread copies
+    # the context, so the request deadline still bounds the HTTP calls.
+    results = await asyncio.to_thread(fetch_pubmed_abstracts, query, max_results=5)
     return json.dumps(results, indent=2)
 
-def search_clinical_trials(query: str) -> str:
+async def search_clinical_trials(query: str) -> str:
     """
     Searches ClinicalTrials.gov for active studies.
     
@@ -24,5 +53,47 @@ def search_clinical_trials(query: str) -> str:
     Returns:
         A JSON string containing a list of clinical trials.
     """
-    results = fetch_clinical_trials(query, max_results=5)
+    results = await asyncio.to_thread(fetch_clinical_trials, query, max_results=5)
     return json.dumps(results, indent=2)
+
+async def search_local_corpus(
+    query: str,
+    source: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    journal: Optional[str] = None,
+    author: Optional[str] = None
+) -> str:
+    """
+    Searches the locally indexed corpus of PubMed abstracts and clinical trials.
+    Filters are applied before ranking, so use them whenever the question names
+    a source, a time range, a journal or an author.
+    
+    Args:
+        query: The search keywords.
+        source: "PubMed" or "ClinicalTrials.gov".
+        year_from: Earliest year, inclusive (publication year for papers, start year for trials).
+        year_to: Latest year, inclusive.
+        journal: Part of the journal name (e.g., "Immunity").
+        author: Author full name or last name (e.g., "Bluestone").
+        
+    Returns:
+        A JSON string containing a list of matching documents with metadata and text.
+    """
+    filters = {
+        "source": source,
+        "year_from": year_from,
+        "year_to": year_to,
+        "journal": journal,
+        "author": author
+    }
+    try:
+        agent = _get_corpus_agent()
+    except RuntimeError as e:
+        return json.dumps({"error": f"Local corpus unavailable: {e}"})
+    try:
+        # Query embedding is a blocking API call; keep it off the event loop
+        results = await asyncio.to_thread(agent.retrieve, query, **filters)
+    except Exception as e:
+        return json.dumps({"error": f"Local corpus search failed: {e}"})
+    return json.dumps(results, indent=2, default=str)